@@ -1,15 +1,18 @@
 import openai
 import requests
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional
 import uuid
 from .plugins.plugin import PluginInterface
+from .executor import load_plugin_class, get_process_pool, ProcessPluginProxy
+from .validation import ArgumentValidator, get_validator
 import yaml
-import importlib.util
 import os
 
 GPT_MODEL = "gpt-3.5-turbo-0613"  # "gpt-3.5-turbo-16k-0613"
 
+HISTORY_PAGE_SIZE = 20
+
 SYSTEM_PROMPT = """
     You are a helpful AI assistant. You answer the user's queries.
     When you are not sure of an answer, you take the help of
@@ -48,6 +51,7 @@ class ChatSession:
         self.session_id = str(uuid.uuid4())
         self.conversation = Conversation()
         self.plugins: Dict[str, PluginInterface] = {}
+        self.validators: Dict[str, Optional[ArgumentValidator]] = {}
         self.load_plugins()
         self.conversation.add_message("system", SYSTEM_PROMPT)
 
@@ -66,15 +70,15 @@ class ChatSession:
     def _import_plugin(self, plugin_manifest, plugin_dir):
         """
         Dynamically import a plugin and register it.
+        Plugins with a `process_pool` section in their manifest are
+        executed out of process.
         """
-        spec = importlib.util.spec_from_file_location(
-            plugin_manifest['main'].replace('.py', ''),
-            os.path.join(plugin_dir, plugin_manifest['main'])
-        )
-        plugin_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(plugin_module)
-        plugin_class = getattr(plugin_module, plugin_manifest['class'])
-        self.register_plugin(plugin_class())
+        plugin_class = load_plugin_class(plugin_manifest, plugin_dir)
+        plugin = plugin_class()
+        if plugin_manifest.get('process_pool'):
+            pool = get_process_pool(plugin_manifest, plugin_dir)
+            plugin = ProcessPluginProxy(plugin, pool)
+        self.register_plugin(plugin)
 
     def register_plugin(self, plugin: PluginInterface):
         """
@@ -83,14 +87,34 @@ class ChatSession:
         # log the name of the plugins using a logger component
         print(f"Registering plugin: {plugin.get_name()}")
         self.plugins[plugin.get_name()] = plugin
+        self.validators[plugin.get_name()] = get_validator(
+            plugin.get_name(), plugin.get_parameters())
 
-    def get_messages(self) -> List[Dict]:
+    def get_history_page(self, before: Optional[int] = None,
+                         limit: int = HISTORY_PAGE_SIZE) -> Dict:
         """
-        Return the list of messages from the current conversation
+        Return a page of at most `limit` messages older than the
+        `before` cursor (the newest messages when it is None), oldest first.
+        System messages, i.e. the system prompt and the plugin
+        responses, are left out. Each message carries its `id` in the
+        conversation history and `next_cursor` is None on the last page.
         """
-        if len(self.conversation.conversation_history) == 1:
-            return []
-        return self.conversation.conversation_history[1:]
+        history = self.conversation.conversation_history
+        index = len(history) if before is None else min(before, len(history))
+        index -= 1
+        messages = []
+        while index >= 0 and len(messages) < limit:
+            message = history[index]
+            if message["role"] != "system":
+                messages.append({"id": index, **message})
+            index -= 1
+        while index >= 0 and history[index]["role"] == "system":
+            index -= 1
+        messages.reverse()
+        return {
+            "messages": messages,
+            "next_cursor": index + 1 if index >= 0 else None,
+        }
 
     def _get_functions(self) -> List[Dict]:
         """
@@ -112,6 +136,33 @@ class ChatSession:
         }
         return function
 
+    def _parse_arguments(self, func_name: str, raw_arguments: str):
+        """
+        Decode the arguments of a function call and validate them
+        against the plugin's parameters.
+        Return the arguments and the list of validation errors.
+        """
+        errors = []
+        try:
+            arguments = json.loads(raw_arguments or "{}")
+        except json.JSONDecodeError as e:
+            arguments = None
+            errors = [f"$: arguments are not valid JSON: {e}"]
+        else:
+            if not isinstance(arguments, dict):
+                errors = ["$: arguments must be a JSON object"]
+
+        validator = self.validators[func_name]
+        if validator is not None:
+            if errors:
+                validator.reject()
+            else:
+                errors = validator.validate(arguments)
+        if errors:
+            summary = f" ({validator.summary()})" if validator is not None else ""
+            print(f"Rejected call to plugin {func_name}: {errors}{summary}")
+        return arguments, errors
+
     def _execute_plugin(self, func_call) -> str:
         """
         If a plugin exists for the given function call, execute it.
@@ -119,9 +170,15 @@ class ChatSession:
         func_name = func_call.get("name")
         print(f"Executing plugin {func_name}")
         if func_name in self.plugins:
-            arguments = json.loads(func_call.get("arguments"))
-            plugin = self.plugins[func_name]
-            plugin_response = plugin.execute(**arguments)
+            arguments, errors = self._parse_arguments(
+                func_name, func_call.get("arguments"))
+            if errors:
+                plugin_response = {
+                    "error": f"Invalid arguments for plugin {func_name}",
+                    "details": errors}
+            else:
+                plugin = self.plugins[func_name]
+                plugin_response = plugin.execute(**arguments)
         else:
             plugin_response = {
                 "error": f"No plugin found with name {func_name}"}
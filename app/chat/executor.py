@@ -0,0 +1,239 @@
+import importlib.util
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+from .plugins.plugin import PluginInterface
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_TIMEOUT = 30  # seconds
+DEFAULT_MAX_CALLS_PER_WORKER = 100
+POLL_INTERVAL = 0.1  # seconds between timeout / memory checks
+
+# Workers are spawned rather than forked so that they do not inherit
+# the locks and threads of the (multi-threaded) Flask process.
+_mp_context = multiprocessing.get_context("spawn")
+
+_pools: Dict[str, "PluginProcessPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def load_plugin_class(plugin_manifest: Dict, plugin_dir: str):
+    """
+    Import the plugin module described by the manifest and
+    return its plugin class.
+    """
+    spec = importlib.util.spec_from_file_location(
+        plugin_manifest['main'].replace('.py', ''),
+        os.path.join(plugin_dir, plugin_manifest['main'])
+    )
+    plugin_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plugin_module)
+    return getattr(plugin_module, plugin_manifest['class'])
+
+
+def _limit_memory(max_memory_mb: int):
+    """
+    Cap the address space of the current process so that an allocation
+    beyond the limit fails with MemoryError instead of exhausting the host.
+    """
+    if resource is None or not hasattr(resource, "RLIMIT_AS"):
+        print("Unable to set a hard memory limit on this platform")
+        return
+    limit = max_memory_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError) as e:
+        print(f"Unable to set a hard memory limit: {e}")
+
+
+def _worker_main(conn, plugin_manifest: Dict, plugin_dir: str,
+                 max_memory_mb: Optional[int]):
+    """
+    Entry point of a worker process. Loads the plugin once and then
+    executes every call received on the pipe until it is closed.
+    """
+    if max_memory_mb:
+        _limit_memory(max_memory_mb)
+    plugin = load_plugin_class(plugin_manifest, plugin_dir)()
+    while True:
+        try:
+            arguments = conn.recv()
+        except EOFError:
+            break
+        try:
+            response = plugin.execute(**arguments)
+        except MemoryError:
+            response = {"error": f"Plugin {plugin_manifest['name']} exceeded its "
+                                 f"memory limit of {max_memory_mb} MB"}
+        except Exception as e:
+            response = {"error": str(e)}
+        conn.send(response)
+
+
+class _Worker:
+    """
+    A single worker process along with the parent end of its pipe.
+    """
+
+    def __init__(self, plugin_manifest: Dict, plugin_dir: str,
+                 max_memory_mb: Optional[int]):
+        self.conn, child_conn = _mp_context.Pipe()
+        self.process = _mp_context.Process(
+            target=_worker_main,
+            args=(child_conn, plugin_manifest, plugin_dir, max_memory_mb),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def rss_mb(self) -> Optional[float]:
+        """
+        Return the resident set size of the worker in MB, or None
+        if it cannot be determined on this platform.
+        """
+        try:
+            with open(f"/proc/{self.process.pid}/statm") as f:
+                pages = int(f.read().split()[1])
+        except (OSError, ValueError, IndexError):
+            return None
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+    def stop(self):
+        """
+        Kill the worker process. This is how a running call is cancelled.
+        """
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+class PluginProcessPool:
+    """
+    A pool of worker processes executing a single plugin.
+    Each call is bounded by a timeout and a memory limit; a worker
+    which exceeds either is killed and replaced on the next call.
+    The memory limit is enforced as a hard address space limit in the
+    worker where the platform supports it, and by polling the worker's
+    RSS. Workers are also recycled after a fixed number of calls.
+    """
+
+    def __init__(self, plugin_manifest: Dict, plugin_dir: str):
+        settings = plugin_manifest.get('process_pool') or {}
+        self.name = plugin_manifest['name']
+        self.plugin_manifest = plugin_manifest
+        self.plugin_dir = plugin_dir
+        self.timeout = settings.get('timeout', DEFAULT_TIMEOUT)
+        self.max_memory_mb = settings.get('max_memory_mb')
+        self.max_calls_per_worker = settings.get(
+            'max_calls_per_worker', DEFAULT_MAX_CALLS_PER_WORKER)
+        self.max_workers = settings.get('workers') or os.cpu_count() or 1
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.max_workers)
+        self._rss_warned = False
+
+    def execute(self, arguments: Dict) -> Dict:
+        """
+        Execute the plugin in a worker process and return its response.
+        Blocks while all workers of the pool are busy.
+        """
+        with self._slots:
+            worker = self._checkout()
+            response = self._run(worker, arguments)
+            self._checkin(worker)
+        return response
+
+    def _checkout(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return _Worker(self.plugin_manifest, self.plugin_dir,
+                               self.max_memory_mb)
+            if worker.process.is_alive():
+                return worker
+            worker.stop()
+
+    def _checkin(self, worker: _Worker):
+        if (not worker.process.is_alive()
+                or worker.calls >= self.max_calls_per_worker
+                or self._over_memory_limit(worker)):
+            worker.stop()
+        else:
+            self._idle.put(worker)
+
+    def _over_memory_limit(self, worker: _Worker) -> bool:
+        if not self.max_memory_mb:
+            return False
+        rss = worker.rss_mb()
+        if rss is None:
+            if not self._rss_warned:
+                print(f"Unable to measure the RSS of plugin {self.name} workers, "
+                      "relying on the hard memory limit only")
+                self._rss_warned = True
+            return False
+        return rss > self.max_memory_mb
+
+    def _run(self, worker: _Worker, arguments: Dict) -> Dict:
+        deadline = time.monotonic() + self.timeout
+        try:
+            worker.conn.send(arguments)
+            while not worker.conn.poll(POLL_INTERVAL):
+                if time.monotonic() >= deadline:
+                    worker.stop()
+                    return {"error": f"Plugin {self.name} timed out "
+                                     f"after {self.timeout} seconds"}
+                if self._over_memory_limit(worker):
+                    worker.stop()
+                    return {"error": f"Plugin {self.name} exceeded its "
+                                     f"memory limit of {self.max_memory_mb} MB"}
+            response = worker.conn.recv()
+        except (EOFError, OSError) as e:
+            worker.stop()
+            return {"error": f"Plugin {self.name} worker failed: {e}"}
+        worker.calls += 1
+        return response
+
+
+def get_process_pool(plugin_manifest: Dict, plugin_dir: str) -> PluginProcessPool:
+    """
+    Return the process pool for the given plugin, creating it on first use.
+    Pools are shared by all chat sessions.
+    """
+    with _pools_lock:
+        if plugin_dir not in _pools:
+            _pools[plugin_dir] = PluginProcessPool(plugin_manifest, plugin_dir)
+        return _pools[plugin_dir]
+
+
+class ProcessPluginProxy(PluginInterface):
+    """
+    Stands in for a plugin marked with `process_pool` in its manifest.
+    Metadata comes from a local instance of the plugin while
+    execute() is dispatched to the plugin's process pool.
+    """
+
+    def __init__(self, plugin: PluginInterface, pool: PluginProcessPool):
+        self.plugin = plugin
+        self.pool = pool
+
+    def get_name(self) -> str:
+        return self.plugin.get_name()
+
+    def get_description(self) -> str:
+        return self.plugin.get_description()
+
+    def get_parameters(self) -> Dict:
+        return self.plugin.get_parameters()
+
+    def execute(self, **kwargs) -> Dict:
+        return self.pool.execute(kwargs)
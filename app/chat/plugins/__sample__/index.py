@@ -32,7 +32,8 @@ class SamplePlugin(PluginInterface):
                     "type": "string",
                     "description": "Python code which needs to be executed"
                 }
-            }
+            },
+            "required": ["code"]
         }
         return parameters
     
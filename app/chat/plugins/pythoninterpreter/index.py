@@ -40,7 +40,8 @@ class PythonInterpreterPlugin(PluginInterface):
                     "type": "string",
                     "description": "Python code which needs to be executed. The python code MUST ALWAYS print the result on stdout at the end of the execution with print(result). If no print result is provided, the plugin will return an error."
                 }
-            }
+            },
+            "required": ["code"]
         }
         return parameters
 
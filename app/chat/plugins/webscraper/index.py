@@ -29,7 +29,8 @@ class WebScraperPlugin(PluginInterface):
                     "type": "string",
                     "description": "URL of the web page which needs to be scraped"
                 }
-            }
+            },
+            "required": ["url"]
         }
         return parameters
     
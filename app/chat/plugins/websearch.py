@@ -35,7 +35,8 @@ class WebSearchPlugin(PluginInterface):
                     "type": "string",
                     "description": "the user query"
                 }
-            }
+            },
+            "required": ["q"]
         }
         return parameters
     
@@ -0,0 +1,220 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+# A compiled check appends an error message for every violation
+# found in `value` to `errors`. `path` locates the value in the arguments.
+Check = Callable[[Any, str, List[str]], None]
+
+_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+    "null": (type(None),),
+}
+
+
+@dataclass
+class ValidationStats:
+    """
+    Counters for the argument validation of a single plugin.
+    """
+    calls: int = 0
+    rejections: int = 0
+    total_seconds: float = 0.0
+
+
+# Shared by all chat sessions, keyed by plugin name
+validation_stats: Dict[str, ValidationStats] = {}
+
+_validators: Dict[str, Optional["ArgumentValidator"]] = {}
+_validators_lock = threading.Lock()
+
+
+class ArgumentValidator:
+    """
+    Validates plugin call arguments against the plugin's JSON schema.
+    The schema is compiled once into a tree of check functions so
+    that validating a call does not walk the schema again.
+    Supports the subset of JSON schema used for function parameters.
+    """
+
+    def __init__(self, name: str, schema: Dict):
+        self.name = name
+        self._check = _compile(schema)
+        self.stats = validation_stats.setdefault(name, ValidationStats())
+        # The validator is shared by concurrent requests
+        self._stats_lock = threading.Lock()
+
+    def validate(self, arguments: Dict) -> List[str]:
+        """
+        Return the list of errors for the given arguments,
+        empty if they are valid.
+        """
+        start = time.perf_counter()
+        errors: List[str] = []
+        self._check(arguments, "$", errors)
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.stats.calls += 1
+            self.stats.total_seconds += elapsed
+            if errors:
+                self.stats.rejections += 1
+        return errors
+
+    def reject(self):
+        """
+        Record a call rejected before validation, e.g. because
+        its arguments are not a JSON object.
+        """
+        with self._stats_lock:
+            self.stats.calls += 1
+            self.stats.rejections += 1
+
+    def summary(self) -> str:
+        """
+        Return a one line summary of the validation stats.
+        """
+        with self._stats_lock:
+            calls = self.stats.calls
+            rejections = self.stats.rejections
+            total_seconds = self.stats.total_seconds
+        return (f"{rejections}/{calls} calls rejected, "
+                f"{total_seconds / calls * 1e6:.1f}us validation time per call")
+
+
+def get_validator(name: str, schema: Dict) -> Optional[ArgumentValidator]:
+    """
+    Return the validator for the given plugin, compiling its schema on
+    first use. Validators are shared by all chat sessions.
+    Return None if the schema cannot be compiled, in which case
+    calls to the plugin are not validated.
+    """
+    with _validators_lock:
+        if name not in _validators:
+            try:
+                _validators[name] = ArgumentValidator(name, schema)
+            except Exception as e:
+                print(f"Unable to compile the parameters of plugin {name}, "
+                      f"its calls will not be validated: {e}")
+                _validators[name] = None
+        return _validators[name]
+
+
+def _compile(schema: Dict) -> Check:
+    """
+    Compile a JSON schema into a single check function.
+    """
+    checks: List[Check] = []
+
+    if "type" in schema:
+        checks.append(_compile_type(schema["type"]))
+    if "enum" in schema:
+        checks.append(_compile_enum(schema["enum"]))
+    if "minLength" in schema or "maxLength" in schema:
+        checks.append(_compile_length(schema.get("minLength"), schema.get("maxLength")))
+    if "minimum" in schema or "maximum" in schema:
+        checks.append(_compile_range(schema.get("minimum"), schema.get("maximum")))
+    if "properties" in schema or "required" in schema:
+        checks.append(_compile_object(schema))
+    if "items" in schema:
+        checks.append(_compile_items(schema["items"]))
+
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(value, path, errors):
+        for c in checks:
+            c(value, path, errors)
+    return check
+
+
+def _compile_type(type_names) -> Check:
+    if isinstance(type_names, str):
+        type_names = [type_names]
+    if any(name not in _TYPES for name in type_names):
+        # Types outside the supported subset are not checked
+        return _no_check
+    types = tuple(t for name in type_names for t in _TYPES[name])
+    allows_bool = "boolean" in type_names
+    allows_integral_float = "integer" in type_names
+    expected = " or ".join(type_names)
+
+    def check(value, path, errors):
+        # bool is a subclass of int but is not a JSON number
+        if isinstance(value, bool):
+            if not allows_bool:
+                errors.append(f"{path}: expected {expected}")
+        elif not isinstance(value, types):
+            # JSON schema treats numbers like 3.0 as integers
+            if not (allows_integral_float and isinstance(value, float)
+                    and value.is_integer()):
+                errors.append(f"{path}: expected {expected}")
+    return check
+
+
+def _no_check(value, path, errors):
+    pass
+
+
+def _compile_enum(values) -> Check:
+    def check(value, path, errors):
+        if value not in values:
+            errors.append(f"{path}: must be one of {values}")
+    return check
+
+
+def _compile_length(min_length, max_length) -> Check:
+    def check(value, path, errors):
+        if not isinstance(value, str):
+            return
+        if min_length is not None and len(value) < min_length:
+            errors.append(f"{path}: must be at least {min_length} characters long")
+        if max_length is not None and len(value) > max_length:
+            errors.append(f"{path}: must be at most {max_length} characters long")
+    return check
+
+
+def _compile_range(minimum, maximum) -> Check:
+    def check(value, path, errors):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return
+        if minimum is not None and value < minimum:
+            errors.append(f"{path}: must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            errors.append(f"{path}: must be at most {maximum}")
+    return check
+
+
+def _compile_object(schema: Dict) -> Check:
+    properties = {name: _compile(s) for name, s in schema.get("properties", {}).items()}
+    required = schema.get("required", [])
+    allow_additional = schema.get("additionalProperties", True) is not False
+
+    def check(value, path, errors):
+        if not isinstance(value, dict):
+            return
+        for name in required:
+            if name not in value:
+                errors.append(f"{path}.{name}: required property missing")
+        for name, item in value.items():
+            if name in properties:
+                properties[name](item, f"{path}.{name}", errors)
+            elif not allow_additional:
+                errors.append(f"{path}.{name}: unexpected property")
+    return check
+
+
+def _compile_items(schema: Dict) -> Check:
+    item_check = _compile(schema)
+
+    def check(value, path, errors):
+        if not isinstance(value, list):
+            return
+        for i, item in enumerate(value):
+            item_check(item, f"{path}[{i}]", errors)
+    return check
@@ -1,9 +1,16 @@
-from flask import Flask, render_template, request, session, jsonify
+from flask import Flask, render_template, request, session, jsonify, Response
 from typing import Dict
 from dotenv import load_dotenv
-from .chat.chat import ChatSession
+from .chat.chat import ChatSession, HISTORY_PAGE_SIZE
+import gzip
+import hashlib
 import os
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 load_dotenv()
 
 app = Flask(__name__)
@@ -11,10 +18,21 @@ app.secret_key = os.getenv("CHAT_APP_SECRET_KEY")
 
 chat_sessions: Dict[str, ChatSession] = {}
 
+MAX_HISTORY_PAGE_SIZE = 100
+
 @app.route("/")
 def index():
+    _get_user_session()
+    return render_template("chat.html", page_size=HISTORY_PAGE_SIZE)
+
+@app.route('/history')
+def history():
     chat_session = _get_user_session()
-    return render_template("chat.html", conversation=chat_session.get_messages())
+    before = request.args.get('before', type=int)
+    limit = request.args.get('limit', HISTORY_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_HISTORY_PAGE_SIZE))
+    page = chat_session.get_history_page(before=before, limit=limit)
+    return _compressed(jsonify(page))
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -23,6 +41,31 @@ def chat():
     chatgpt_message = chat_session.get_chatgpt_response(message)
     return jsonify({"message": chatgpt_message})
 
+def _compressed(response: Response) -> Response:
+    """
+    Answer conditional GETs using an ETag and otherwise compress the
+    response body with brotli or gzip, depending on what the client
+    prefers. The ETag is computed before compressing so that a 304
+    does not pay for the compression.
+    """
+    encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+    encoding = request.accept_encodings.best_match(encodings)
+    data = response.get_data()
+    etag = hashlib.sha1(data + (encoding or 'identity').encode()).hexdigest()
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.make_conditional(request)
+    if response.status_code == 304:
+        return response
+    if encoding == 'br':
+        response.set_data(brotli.compress(data))
+    elif encoding == 'gzip':
+        response.set_data(gzip.compress(data, mtime=0))
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
 def _get_user_session() -> ChatSession:
     chat_session_id = session.get("chat_session_id")
     if not chat_session_id or chat_session_id not in chat_sessions:
@@ -31,4 +74,4 @@ def _get_user_session() -> ChatSession:
         session["chat_session_id"] = chat_session.session_id
     else:
         chat_session = chat_sessions[chat_session_id]
-    return chat_session
\ No newline at end of file
+    return chat_session